@@ -0,0 +1,126 @@
+import os
+import re
+import json
+import time
+import hashlib
+import pandas as pd
+
+CACHE_DIR = '.cache'
+
+# Time-to-live per endpoint, in seconds
+DEFAULT_TTLS = {
+    'cashflow': 7 * 24 * 3600,   # Statements change quarterly at best
+    'dividends': 7 * 24 * 3600,
+    'info': 24 * 3600,
+    'history': 24 * 3600,        # Daily bars; one new row per session
+}
+
+# Tickers become directory names, so only symbol characters are accepted (BRK-B, ^GSPC, EURUSD=X)
+# and a name made only of dots is rejected, which keeps every path inside the cache directory
+TICKER_PATTERN = re.compile(r'(?!\.+$)[A-Z0-9.\-^=]+')
+
+def is_valid_ticker(ticker):
+    return isinstance(ticker, str) and TICKER_PATTERN.fullmatch(ticker.upper()) is not None
+
+class FileCache:
+    """
+    Stores JSON-serializable values on disk with a per-endpoint time-to-live.
+
+    Entries live in {cache_dir}/{ticker}/{endpoint}.json, keyed inside the file
+    by an md5 of the request parameters, as {"value": ..., "timestamp": ...}.
+    DataFrames are stored separately as parquet, one file per endpoint and parameter.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, ttls=None):
+        self.cache_dir = cache_dir
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+    def _ticker_dir(self, ticker):
+        if not is_valid_ticker(ticker):
+            raise ValueError(f"Invalid ticker for the cache: {ticker!r}")
+        return os.path.join(self.cache_dir, ticker.upper())
+
+    def _path(self, ticker, endpoint):
+        return os.path.join(self._ticker_dir(ticker), f"{endpoint}.json")
+
+    @staticmethod
+    def _key(params):
+        return hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _load(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, ticker, endpoint, params=None, ttl=None):
+        """Returns the cached value, or None if it is missing or expired."""
+        ttl = self.ttls.get(endpoint, 0) if ttl is None else ttl
+        entry = self._load(self._path(ticker, endpoint)).get(self._key(params))
+        if entry is None or time.time() - entry['timestamp'] > ttl:
+            return None
+        return entry['value']
+
+    def set(self, ticker, endpoint, value, params=None):
+        path = self._path(ticker, endpoint)
+        blob = self._load(path)
+        blob[self._key(params)] = {'value': value, 'timestamp': time.time()}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so a crash never leaves half a JSON file behind
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(blob, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not write cache file {path}: {e}")
+
+    def get_or_fetch(self, ticker, endpoint, fetch_fn, params=None, ttl=None):
+        """
+        Returns the cached value if still fresh, otherwise calls fetch_fn() and caches
+        its result. None results are returned but never cached, and neither is anything
+        for a ticker that is not a valid symbol.
+        """
+        if not is_valid_ticker(ticker):
+            return fetch_fn()
+        value = self.get(ticker, endpoint, params, ttl)
+        if value is not None:
+            return value
+        value = fetch_fn()
+        if value is not None:
+            self.set(ticker, endpoint, value, params)
+        return value
+
+    def _frame_path(self, ticker, endpoint, params):
+        name = endpoint if params is None else f"{endpoint}_{params}"
+        return os.path.join(self._ticker_dir(ticker), f"{name}.parquet")
+
+    def get_or_fetch_frame(self, ticker, endpoint, fetch_fn, params=None, ttl=None):
+        """
+        DataFrame counterpart of get_or_fetch. The frame is stored in
+        {cache_dir}/{ticker}/{endpoint}_{params}.parquet and its age is the file's mtime.
+        Empty frames, and frames for invalid tickers, are returned but never cached.
+        """
+        if not is_valid_ticker(ticker):
+            return fetch_fn()
+        ttl = self.ttls.get(endpoint, 0) if ttl is None else ttl
+        path = self._frame_path(ticker, endpoint, params)
+        try:
+            if time.time() - os.path.getmtime(path) <= ttl:
+                return pd.read_parquet(path)
+        except Exception:
+            pass # Missing, unreadable or corrupt; fetch a fresh copy
+
+        df = fetch_fn()
+        if df is not None and not df.empty:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                df.to_parquet(tmp_path, compression='zstd')
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"Warning: could not write cache file {path}: {e}")
+        return df
+
+file_cache = FileCache()
@@ -1,6 +1,15 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
+from functools import lru_cache
+from cache import file_cache
+
+@lru_cache(maxsize=None)
+def _ticker(symbol):
+    """
+    Returns a shared yf.Ticker per symbol so repeated lookups reuse its fetched data.
+    """
+    return yf.Ticker(symbol)
 
 def format_large_number(num):
     """
@@ -18,20 +27,24 @@ def format_large_number(num):
 def get_free_cash_flow(ticker_symbol):
     """
     Fetches historical Free Cash Flow (FCF) from Yahoo Finance's financial statements.
+    Results are cached on disk, so reruns within the cashflow TTL skip the network.
     """
+    return file_cache.get_or_fetch(ticker_symbol, 'cashflow', lambda: _fetch_free_cash_flow(ticker_symbol))
+
+def _fetch_free_cash_flow(ticker_symbol):
     try:
-        stock = yf.Ticker(ticker_symbol)
+        stock = _ticker(ticker_symbol)
         cash_flow = stock.cashflow
         
         if 'Free Cash Flow' in cash_flow.index:
             fcf_data = cash_flow.loc['Free Cash Flow']
-            return fcf_data.iloc[0] # Most recent FCF
+            return float(fcf_data.iat[0]) # Most recent FCF
         else:
             print(f"Warning: 'Free Cash Flow' not directly found for {ticker_symbol}. Attempting approximation...")
             if 'Total Cash From Operating Activities' in cash_flow.index and 'Capital Expenditures' in cash_flow.index:
-                operating_cf = cash_flow.loc['Total Cash From Operating Activities'].iloc[0]
-                capex = cash_flow.loc['Capital Expenditures'].iloc[0] # Often negative
-                return operating_cf + capex 
+                operating_cf = cash_flow.loc['Total Cash From Operating Activities'].iat[0]
+                capex = cash_flow.loc['Capital Expenditures'].iat[0] # Often negative
+                return float(operating_cf + capex)
             else:
                 print(f"Error: Could not find sufficient data to calculate FCF for {ticker_symbol}.")
                 return None
@@ -39,6 +52,19 @@ def get_free_cash_flow(ticker_symbol):
         print(f"An error occurred while fetching FCF for {ticker_symbol}: {e}")
         return None
 
+# The only .info fields the equity bridge needs
+BALANCE_FIELDS = ['totalCash', 'totalDebt', 'sharesOutstanding']
+
+def _fetch_info_fields(ticker_symbol, fields):
+    """
+    Fetches .info and keeps only the requested fields, so the cached blob stays a few bytes
+    instead of the full quoteSummary payload. Returns None (never cached) when Yahoo sent
+    none of them, so a failed response isn't reused for the next day.
+    """
+    info = _ticker(ticker_symbol).info or {}
+    values = {field: info[field] for field in fields if field in info}
+    return values or None
+
 def calculate_dcf_value(ticker_symbol, years_to_project=5, fcf_growth_rate_short_term=0.10, 
                         fcf_growth_rate_long_term=0.03, discount_rate=0.08, terminal_growth_rate=0.02):
     """
@@ -56,40 +82,31 @@ def calculate_dcf_value(ticker_symbol, years_to_project=5, fcf_growth_rate_short
     print(f"Discount Rate (WACC): {discount_rate*100:.1f}%")
     print(f"Terminal Growth Rate: {terminal_growth_rate*100:.1f}%")
 
-    # 1. Project Free Cash Flows (FCF) for the explicit period
-    projected_fcf = []
-    for i in range(1, years_to_project + 1):
-        if i == 1:
-            next_fcf = current_fcf * (1 + fcf_growth_rate_short_term)
-        else:
-            next_fcf = projected_fcf[-1] * (1 + fcf_growth_rate_short_term)
-        projected_fcf.append(next_fcf)
+    if discount_rate <= terminal_growth_rate:
+        print("Error: Discount rate must be greater than terminal growth rate for Terminal Value calculation.")
+        return None
+
+    # 1-2. Present Value of Projected FCFs for the explicit period.
+    # Growth and discounting are fused into one ratio: FCF_t / (1+r)^t = FCF_0 * ((1+g)/(1+r))^t
+    t = np.arange(1, years_to_project + 1)
+    ratio = (1.0 + fcf_growth_rate_short_term) / (1.0 + discount_rate)
+    pv_fcf = current_fcf * ratio ** t
     
-    print("\nProjected Free Cash Flows:")
-    for i, fcf in enumerate(projected_fcf):
-        print(f"Year {i+1}: ${format_large_number(fcf)}")
-
-    # 2. Calculate Present Value of Projected FCFs
-    pv_fcf = []
-    for i, fcf in enumerate(projected_fcf):
-        pv = fcf / ((1 + discount_rate) ** (i + 1))
-        pv_fcf.append(pv)
+    print("\nPresent Value of Projected Free Cash Flows:")
+    for i, pv in enumerate(pv_fcf):
+        print(f"Year {i+1}: ${format_large_number(pv)}")
     
-    pv_of_explicit_fcf = sum(pv_fcf)
+    pv_of_explicit_fcf = float(pv_fcf.sum())
     print(f"\nPresent Value of Explicit FCFs: ${format_large_number(pv_of_explicit_fcf)}")
 
     # 3. Calculate Terminal Value (TV)
-    last_projected_fcf = projected_fcf[-1]
-    
-    if discount_rate <= terminal_growth_rate:
-        print("Error: Discount rate must be greater than terminal growth rate for Terminal Value calculation.")
-        return None
-        
-    terminal_value = (last_projected_fcf * (1 + terminal_growth_rate)) / (discount_rate - terminal_growth_rate)
+    terminal_multiple = (1 + terminal_growth_rate) / (discount_rate - terminal_growth_rate)
+    terminal_value = current_fcf * (1 + fcf_growth_rate_short_term) ** years_to_project * terminal_multiple
     print(f"Terminal Value (Year {years_to_project}): ${format_large_number(terminal_value)}")
 
     # 4. Calculate Present Value of Terminal Value (PV_TV)
-    pv_terminal_value = terminal_value / ((1 + discount_rate) ** years_to_project)
+    # The last discounted FCF already carries (1+g)^N / (1+r)^N
+    pv_terminal_value = float(pv_fcf[-1]) * terminal_multiple
     print(f"Present Value of Terminal Value: ${format_large_number(pv_terminal_value)}")
 
     # 5. Calculate Total Enterprise Value (TEV)
@@ -98,10 +115,16 @@ def calculate_dcf_value(ticker_symbol, years_to_project=5, fcf_growth_rate_short
 
     # 6. Calculate Equity Value and Intrinsic Value Per Share
     try:
-        stock_info = yf.Ticker(ticker_symbol).info
+        stock_info = file_cache.get_or_fetch(ticker_symbol, 'info', lambda: _fetch_info_fields(ticker_symbol, BALANCE_FIELDS),
+                                             params=BALANCE_FIELDS) or {}
         cash = stock_info.get('totalCash', 0) 
         debt = stock_info.get('totalDebt', 0)
         shares_outstanding = stock_info.get('sharesOutstanding')
+        if not shares_outstanding:
+            try:
+                shares_outstanding = _ticker(ticker_symbol).fast_info['shares']
+            except Exception:
+                shares_outstanding = None
 
         if shares_outstanding is None or shares_outstanding == 0:
             print(f"Error: Could not retrieve shares outstanding for {ticker_symbol}.")
@@ -145,7 +168,7 @@ if __name__ == "__main__":
         print(f"Calculated Intrinsic Value Per Share: ${intrinsic_value:,.2f}")
         
         try:
-            current_price = yf.Ticker(ticker).history(period="1d")['Close'].iloc[-1]
+            current_price = _ticker(ticker).history(period="1d")['Close'].iat[-1]
             print(f"Current Market Price: ${current_price:,.2f}")
             if intrinsic_value > current_price:
                 print(f"{ticker} appears to be Undervalued.")
@@ -18,6 +18,13 @@ TICKERS = ["GOOG", "MSFT", "AAPL", "AMZN", "NVDA", "TSLA"] # Add/remove tickers
 # This should ideally match the timezone in which earnings calls are announced.
 # Many US earnings are announced after market close (EST/EDT).
 EVENT_TIMEZONE = 'America/New_York' 
+LOCAL_TZ = pytz.timezone(EVENT_TIMEZONE)
+
+# Length of each calendar event
+EVENT_DURATION = datetime.timedelta(hours=1)
+
+# How far ahead to look for already-created events (covers the next 4 quarters)
+LOOKAHEAD = datetime.timedelta(days=400)
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/calendar.events']
@@ -54,18 +61,51 @@ def authenticate_google_calendar():
 
 # --- Main Script ---
 
+def get_existing_event_keys(service, time_min, time_max):
+    """
+    Lists every event in the window once and returns a set of (summary, local date) keys,
+    so duplicate checks are in-memory lookups instead of one API call per earnings date.
+    """
+    keys = set()
+    page_token = None
+    while True:
+        events_result = service.events().list(
+            calendarId=CALENDAR_ID,
+            timeMin=time_min.isoformat(),
+            timeMax=time_max.isoformat(),
+            singleEvents=True,
+            maxResults=2500,
+            pageToken=page_token
+        ).execute()
+        for event in events_result.get('items', []):
+            start = event.get('start', {})
+            if 'dateTime' in start:
+                start_local = datetime.datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00')).astimezone(LOCAL_TZ)
+                keys.add((event.get('summary'), start_local.date().isoformat()))
+            elif 'date' in start: # All-day event
+                keys.add((event.get('summary'), start['date']))
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            return keys
+
 def sync_earnings_to_calendar():
     service = authenticate_google_calendar()
     
     print("Fetching earnings dates and syncing to Google Calendar...")
 
+    # Evaluated once per run rather than per ticker
+    now_utc = datetime.datetime.now(pytz.utc)
+
+    # Events scheduled for later today can start before now, so look back a day
+    existing_keys = get_existing_event_keys(service, now_utc - datetime.timedelta(days=1), now_utc + LOOKAHEAD)
+
     for ticker in TICKERS:
         try:
             stock = yf.Ticker(ticker)
             earnings_history = stock.earnings_dates
 
             # Get only future earnings dates
-            future_earnings = earnings_history[earnings_history.index > datetime.datetime.now(pytz.utc)]
+            future_earnings = earnings_history[earnings_history.index > now_utc]
             
             if future_earnings.empty:
                 print(f"No future earnings dates found for {ticker} or data not available.")
@@ -81,8 +121,7 @@ def sync_earnings_to_calendar():
                 # Convert to local timezone for event creation, assuming market close/after hours
                 # A simple way to set a specific time for the event is to assume it's after market close.
                 # Adjust time if earnings are typically before market open for specific companies.
-                local_tz = pytz.timezone(EVENT_TIMEZONE)
-                event_datetime_local = earnings_date_utc.astimezone(local_tz).replace(
+                event_datetime_local = earnings_date_utc.astimezone(LOCAL_TZ).replace(
                     hour=16, minute=15, second=0, microsecond=0
                 ) # Assuming ~15 min after market close for placeholder
 
@@ -90,17 +129,9 @@ def sync_earnings_to_calendar():
                 event_description = f"Estimated earnings announcement for {ticker}. Check company investor relations for exact time and webcast details."
 
                 # Check if event already exists to avoid duplicates
-                events_result = service.events().list(
-                    calendarId=CALENDAR_ID,
-                    timeMin=event_datetime_local.isoformat(),
-                    timeMax=(event_datetime_local + datetime.timedelta(hours=1)).isoformat(), # Check within a 1-hour window
-                    q=event_summary, # Search for existing events with this summary
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                existing_events = events_result.get('items', [])
-
-                if not existing_events:
+                event_key = (event_summary, event_datetime_local.date().isoformat())
+
+                if event_key not in existing_keys:
                     event = {
                         'summary': event_summary,
                         'description': event_description,
@@ -109,7 +140,7 @@ def sync_earnings_to_calendar():
                             'timeZone': EVENT_TIMEZONE,
                         },
                         'end': {
-                            'dateTime': (event_datetime_local + datetime.timedelta(hours=1)).isoformat(), # 1-hour event
+                            'dateTime': (event_datetime_local + EVENT_DURATION).isoformat(),
                             'timeZone': EVENT_TIMEZONE,
                         },
                         'reminders': {
@@ -122,6 +153,7 @@ def sync_earnings_to_calendar():
                     }
 
                     event = service.events().insert(calendarId=CALENDAR_ID, body=event).execute()
+                    existing_keys.add(event_key)
                     print(f"  Event created for {ticker}: {event_summary} on {event_datetime_local.strftime('%Y-%m-%d %H:%M')}")
                 else:
                     print(f"  Event already exists for {ticker}: {event_summary} on {event_datetime_local.strftime('%Y-%m-%d %H:%M')}")
@@ -2,6 +2,7 @@ import google.generativeai as genai
 import pandas as pd
 # import yfinance as yf # Uncomment and install if you want to fetch live historical data
 import os # To get API key from environment variables (recommended)
+import asyncio
 
 # Configure the Gemini API with your API key
 # It's highly recommended to load your API key from environment variables
@@ -16,7 +17,7 @@ if genai.get_default_options().get('') is None:
     raise ValueError("Gemini API key not found. Please set the GOOGLE_API_KEY environment variable or replace os.getenv() with your key.")
 
 
-# Initialize the Gemini model
+# Initialize the Gemini model once per process; every analysis reuses it
 model = genai.GenerativeModel('gemini-pro')
 
 def get_stock_news(ticker):
@@ -50,9 +51,10 @@ def get_stock_news(ticker):
         return [f"No specific dummy news found for {ticker}."
                 f"Consider fetching real-time news from a financial news API for a robust analysis."]
 
-def analyze_stock_with_gemini(ticker):
+async def analyze_stock_with_gemini(ticker):
     """
     Analyzes a stock using Gemini based on recent news.
+    Async so several tickers can be analyzed concurrently with asyncio.gather.
     """
     news_articles = get_stock_news(ticker)
 
@@ -74,43 +76,29 @@ def analyze_stock_with_gemini(ticker):
     """
 
     try:
-        response = model.generate_content(prompt)
+        # Stream the response and collect chunks as they arrive instead of waiting for the full body
+        response = await model.generate_content_async(prompt, stream=True)
+        text = "".join([chunk.text async for chunk in response])
         # Ensure the response is not empty
-        if response and response.text:
-            return response.text
+        if text:
+            return text
         else:
             return f"Gemini returned an empty response for {ticker} analysis."
     except Exception as e:
         return f"An error occurred while calling the Gemini API for {ticker}: {e}"
 
 # --- Main execution ---
-if __name__ == "__main__": # Corrected this line!
-    # Example 1: GOOGL
-    stock_ticker_1 = "GOOGL"
-    print(f"--- Analyzing {stock_ticker_1} ---")
-    analysis_result_1 = analyze_stock_with_gemini(stock_ticker_1)
-    print(analysis_result_1)
-
-    print("\n" + "="*80 + "\n") # Separator
-
-    # Example 2: AAPL
-    stock_ticker_2 = "AAPL"
-    print(f"--- Analyzing {stock_ticker_2} ---")
-    analysis_result_2 = analyze_stock_with_gemini(stock_ticker_2)
-    print(analysis_result_2)
-
-    print("\n" + "="*80 + "\n") # Separator
+async def analyze_all(tickers):
+    """Runs every analysis concurrently; total time is the slowest call, not the sum."""
+    return await asyncio.gather(*(analyze_stock_with_gemini(ticker) for ticker in tickers))
 
-    # Example 3: MSFT
-    stock_ticker_3 = "MSFT"
-    print(f"--- Analyzing {stock_ticker_3} ---")
-    analysis_result_3 = analyze_stock_with_gemini(stock_ticker_3)
-    print(analysis_result_3)
-
-    print("\n" + "="*80 + "\n") # Separator
-
-    # Example 4: A ticker with no specific dummy news
-    stock_ticker_4 = "AMZN"
-    print(f"--- Analyzing {stock_ticker_4} ---")
-    analysis_result_4 = analyze_stock_with_gemini(stock_ticker_4)
-    print(analysis_result_4)
\ No newline at end of file
+if __name__ == "__main__": # Corrected this line!
+    # GOOGL, AAPL, MSFT, plus a ticker with no specific dummy news (AMZN)
+    stock_tickers = ["GOOGL", "AAPL", "MSFT", "AMZN"]
+    analysis_results = asyncio.run(analyze_all(stock_tickers))
+
+    for i, (stock_ticker, analysis_result) in enumerate(zip(stock_tickers, analysis_results)):
+        if i > 0:
+            print("\n" + "="*80 + "\n") # Separator
+        print(f"--- Analyzing {stock_ticker} ---")
+        print(analysis_result)
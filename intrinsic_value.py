@@ -1,4 +1,5 @@
 import yfinance as yf
+from cache import file_cache
 
 def calculate_intrinsic_value(ticker_symbol, growth_rate, required_rate_of_return):
     """
@@ -13,17 +14,17 @@ def calculate_intrinsic_value(ticker_symbol, growth_rate, required_rate_of_retur
         float: The calculated intrinsic value of the stock, or None if data is unavailable.
     """
     try:
-        stock = yf.Ticker(ticker_symbol)
+        def fetch_latest_dividend():
+            # Get historical dividends
+            dividends = yf.Ticker(ticker_symbol).dividends
+            return None if dividends.empty else float(dividends.iat[-1])
         
-        # Get historical dividends
-        dividends = stock.dividends
+        latest_dividend = file_cache.get_or_fetch(ticker_symbol, 'dividends', fetch_latest_dividend)
         
-        if dividends.empty:
+        if latest_dividend is None:
             print(f"No dividend data found for {ticker_symbol}. Cannot calculate intrinsic value using DDM.")
             return None
         
-        latest_dividend = dividends.iloc[-1]
-        
         # Ensure required rate of return is greater than growth rate
         if required_rate_of_return <= growth_rate:
             print("Error: Required rate of return must be greater than the growth rate for DDM.")
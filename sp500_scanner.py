@@ -1,71 +1,150 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import datetime
 import gspread
 from google.oauth2.service_account import Credentials
 import os
 import json
+import csv
+import time
+import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def _ticker(symbol):
+    return yf.Ticker(symbol)
 
 # Define the Golden Cross logic
-def calculate_golden_cross(df, short_window=50, long_window=200):
-    if df is None or len(df) < long_window:
-        return None, None
+def _golden_cross_np(close, short_window, long_window):
+    """
+    Golden cross kernel over a (n_series, T) float32 close matrix with T >= long_window.
+    NaN marks bars where a series has no data (e.g. before it was listed); no SMA is
+    produced for windows touching them.
+    Returns per-series arrays: position of the most recent cross (or -1) and whether
+    the short SMA is above the long SMA.
+    """
+    valid = np.isfinite(close)
+    # Rolling means via the cumulative-sum trick, one pass over the whole batch.
+    # The running sum is accumulated in float64 so long series don't lose precision.
+    csum = np.pad(np.where(valid, close, 0.0).cumsum(axis=1, dtype=np.float64), ((0, 0), (1, 0)))
+    count = np.pad(valid.cumsum(axis=1), ((0, 0), (1, 0)))
+    n_long = close.shape[1] - long_window + 1
     
-    sma50 = df['Close'].rolling(window=short_window).mean()
-    sma200 = df['Close'].rolling(window=long_window).mean()
+    def sma(window):
+        means = ((csum[:, window:] - csum[:, :-window]) / window).astype(close.dtype)
+        full = (count[:, window:] - count[:, :-window]) == window
+        # Align to the tail; column i belongs to close[:, long_window - 1 + i]
+        return np.where(full, means, np.nan)[:, -n_long:]
     
-    # Check for cross
-    prev_sma50 = sma50.shift(1)
-    prev_sma200 = sma200.shift(1)
+    sma_short = sma(short_window)
+    sma_long = sma(long_window)
     
-    # Find the most recent cross
-    cross_dates = df.index[(sma50 > sma200) & (prev_sma50 <= prev_sma200)]
-    cross_date = cross_dates[-1] if not cross_dates.empty else None
-            
-    is_bullish = sma50.iloc[-1] > sma200.iloc[-1] if not sma50.empty and not sma200.empty else False
+    # Column i of the mask lines up with sma column i; the first column can never be a cross
+    cross = (sma_short[:, 1:] > sma_long[:, 1:]) & (sma_short[:, :-1] <= sma_long[:, :-1])
+    cross = np.pad(cross, ((0, 0), (1, 0)))
+    last = cross.shape[1] - 1 - np.argmax(cross[:, ::-1], axis=1)
+    last_cross = np.where(cross.any(axis=1), long_window - 1 + last, -1)
+    
+    return last_cross, sma_short[:, -1] > sma_long[:, -1]
+
+def calculate_golden_crosses(closes, short_window=50, long_window=200):
+    """
+    Golden cross for every ticker in a DataFrame of closes (dates x tickers).
+    Returns {ticker: (cross_date, is_bullish)}.
+    """
+    if len(closes) < long_window:
+        return {ticker: (None, None) for ticker in closes.columns}
     
-    return cross_date, is_bullish
+    # Stack every ticker into one contiguous (n_tickers, T) array. Closes carry ~5 significant
+    # digits, so float32 halves the memory traffic without changing any comparison that matters.
+    close_mat = closes.T.to_numpy(dtype=np.float32)
+    last_cross, is_bullish = _golden_cross_np(close_mat, short_window, long_window)
+    
+    return {
+        ticker: (closes.index[last] if last >= 0 else None, bool(bullish))
+        for ticker, last, bullish in zip(closes.columns, last_cross, is_bullish)
+    }
+
+def _close_matrix(batch):
+    """
+    Close prices from a group_by='ticker' yf.download frame as one dates x tickers frame.
+    Gaps are carried forward; bars before a ticker has any data stay NaN.
+    """
+    return batch.xs('Close', level=1, axis=1).ffill().dropna(axis=1, how='all')
+
+# Local copy of the S&P 500 constituents; membership only changes a few times a year.
+# Not committed; the hourly workflow carries it between runs with actions/cache.
+SP500_CACHE_PATH = 'sp500.json'
+SP500_CACHE_TTL = 30 * 24 * 3600
 
 def get_sp500_tickers_with_info():
+    cached = None
+    try:
+        with open(SP500_CACHE_PATH) as f:
+            cached = json.load(f)
+        if time.time() - cached['fetched_at'] < SP500_CACHE_TTL:
+            return cached['tickers'], cached['names']
+    except (OSError, ValueError, KeyError):
+        pass
+    
     try:
         url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
         table = pd.read_html(url)
         df = table[0]
         tickers = df['Symbol'].str.replace('.', '-', regex=False).tolist()
         security_names = dict(zip(tickers, df['Security']))
-        return tickers, security_names
     except Exception as e:
         print(f"Error fetching tickers from Wikipedia: {e}")
+        # A stale list is still better than no list
+        if cached and 'tickers' in cached:
+            print(f"Using cached tickers from {SP500_CACHE_PATH}.")
+            return cached['tickers'], cached.get('names', {})
         return [], {}
+    
+    try:
+        with open(SP500_CACHE_PATH, 'w') as f:
+            json.dump({'fetched_at': time.time(), 'tickers': tickers, 'names': security_names}, f)
+    except OSError as e:
+        print(f"Warning: could not write {SP500_CACHE_PATH}: {e}")
+    
+    return tickers, security_names
+
+# Report columns, in sheet order
+HEADERS = (
+    'Ticker',
+    'Name',
+    'Market Cap',
+    'Daily Golden Cross Date',
+    'Status',
+    'Hourly Golden Cross Date (if Bullish)',
+)
 
-def process_ticker(ticker, security_names):
+def process_ticker(ticker, security_names, closes, daily_crosses, hourly_crosses):
     try:
-        stock = yf.Ticker(ticker)
-        # We need market cap. info is slow, but required if we want it.
-        # However, we can also get market cap from the Wikipedia table if it's there?
-        # Actually Wikipedia doesn't have Market Cap in that table.
-        # Let's try to get it from yfinance info but maybe skip if it's too slow?
-        # Or just use yf.download(tickers, group_by='ticker')
+        if ticker not in daily_crosses:
+            print(f"No daily data for {ticker}")
+            return None
         
-        # Alternative: We can fetch info for all at once if we had a list, but yf doesn't support batch info easily.
-        # Let's use info but in threads.
-        info = stock.info
-        market_cap = info.get('marketCap', 'N/A')
+        stock = _ticker(ticker)
         
-        # Daily data
-        hist_daily = stock.history(period="2y")
-        cross_date, is_bullish = calculate_golden_cross(hist_daily)
+        # Market cap from fast_info's share count and the last close we already have.
+        # This avoids pulling the full .info payload (five quoteSummary modules) for one number.
+        try:
+            market_cap = int(stock.fast_info['shares'] * closes[ticker].iat[-1])
+        except Exception:
+            market_cap = 'N/A'
+        
+        cross_date, is_bullish = daily_crosses[ticker]
         
         status = "Bullish" if is_bullish else "Bearish"
         hourly_cross_date = "N/A"
         
-        if is_bullish:
-            # 1 hour timeframe
-            hist_hourly = stock.history(period="1mo", interval="1h")
-            h_cross_date, _ = calculate_golden_cross(hist_hourly)
-            if h_cross_date:
-                hourly_cross_date = h_cross_date.strftime('%Y-%m-%d %H:%M')
+        # 1 hour timeframe, only downloaded for bullish tickers
+        h_cross_date, _ = hourly_crosses.get(ticker, (None, None))
+        if h_cross_date:
+            hourly_cross_date = h_cross_date.strftime('%Y-%m-%d %H:%M')
         
         return {
             'Ticker': ticker,
@@ -79,6 +158,32 @@ def process_ticker(ticker, security_names):
         print(f"Error processing {ticker}: {e}")
         return None
 
+def write_csv(path, data):
+    with open(path, 'w', newline='') as f:
+        csv.writer(f).writerows(data)
+
+async def fetch_all(tickers, security_names, closes, daily_crosses, hourly_crosses, concurrency=30):
+    """
+    Runs process_ticker for every ticker concurrently, at most `concurrency` at a time,
+    collecting results as they complete so slow tickers don't hold up the rest.
+    """
+    loop = asyncio.get_running_loop()
+    # yfinance is blocking, so each call runs on a worker thread; the pool size is the concurrency ceiling
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    futures = [
+        loop.run_in_executor(None, process_ticker, ticker, security_names, closes, daily_crosses, hourly_crosses)
+        for ticker in tickers
+    ]
+    
+    results = []
+    for done, future in enumerate(asyncio.as_completed(futures), start=1):
+        res = await future
+        if res:
+            results.append(res)
+        if done % 100 == 0 or done == len(futures):
+            print(f"  Processed {done}/{len(futures)} stocks")
+    return results
+
 def main():
     print("Fetching S&P 500 tickers...")
     tickers, security_names = get_sp500_tickers_with_info()
@@ -87,31 +192,36 @@ def main():
         print("No tickers found.")
         return
 
-    print(f"Analyzing {len(tickers)} stocks with multithreading...")
-    results = []
-    
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(process_ticker, ticker, security_names) for ticker in tickers]
-        for future in futures:
-            res = future.result()
-            if res:
-                results.append(res)
-
-    df_results = pd.DataFrame(results)
+    print(f"Downloading daily history for {len(tickers)} stocks...")
+    # One batched request instead of a stock.history() call per ticker
+    all_daily = yf.download(tickers, period="2y", group_by='ticker', threads=True, auto_adjust=True, progress=False)
+
+    closes = _close_matrix(all_daily)
+    daily_crosses = calculate_golden_crosses(closes)
+
+    # Hourly data is only needed for bullish tickers; fetch all of them in one batch
+    bullish = [ticker for ticker, (_, is_bullish) in daily_crosses.items() if is_bullish]
+    hourly_crosses = {}
+    if bullish:
+        print(f"Downloading hourly history for {len(bullish)} bullish stocks...")
+        all_hourly = yf.download(bullish, period="1mo", interval="1h", group_by='ticker', threads=True, auto_adjust=True, progress=False)
+        hourly_crosses = calculate_golden_crosses(_close_matrix(all_hourly))
+
+    print(f"Analyzing {len(tickers)} stocks concurrently...")
+    results = asyncio.run(fetch_all(tickers, security_names, closes, daily_crosses, hourly_crosses))
+
+    # Sort by Market Cap, tickers without one last
+    results.sort(key=lambda r: r['Market Cap'] if isinstance(r['Market Cap'], (int, float)) else -1, reverse=True)
     
-    # Sort by Market Cap if possible
-    try:
-        df_results['Market Cap Numeric'] = pd.to_numeric(df_results['Market Cap'], errors='coerce')
-        df_results = df_results.sort_values(by='Market Cap Numeric', ascending=False).drop(columns=['Market Cap Numeric'], errors='ignore')
-    except:
-        pass
+    # Header plus one row per ticker, shared by the sheet upload and the CSV fallbacks
+    data = [list(HEADERS)] + [[r[c] for c in HEADERS] for r in results]
     
     # Upload to Google Sheets
     try:
         creds_json = os.environ.get('GOOGLE_CREDENTIALS')
         if not creds_json:
             print("GOOGLE_CREDENTIALS not found. Saving to local CSV.")
-            df_results.to_csv(f"sp500_analysis_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.csv", index=False)
+            write_csv(f"sp500_analysis_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.csv", data)
             return
 
         scope = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
@@ -144,11 +254,8 @@ def main():
         # Add a timestamp so the user knows when it was last updated
         timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
         
-        # Convert df to list of lists for gspread
-        data = [df_results.columns.values.tolist()] + df_results.astype(str).values.tolist()
-        
-        # Update the sheet starting from A1
-        worksheet.update(data)
+        # Update the sheet starting from A1; RAW skips Sheets' per-cell USER_ENTERED parsing
+        worksheet.update(range_name='A1', values=data, value_input_option='RAW')
         
         # Add 'Last Updated' at the bottom or top? Let's add it to the Title or a specific cell.
         # Let's just print it. The user will see the data.
@@ -157,7 +264,7 @@ def main():
         
     except Exception as e:
         print(f"Google Sheets Error: {e}")
-        df_results.to_csv("emergency_backup.csv", index=False)
+        write_csv("emergency_backup.csv", data)
 
 if __name__ == "__main__":
     main()
@@ -2,8 +2,9 @@ import streamlit as st
 import yfinance as yf
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-from textblob import TextBlob
+import time
+from concurrent.futures import ThreadPoolExecutor
+from cache import file_cache
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -12,6 +13,59 @@ st.set_page_config(
     layout="wide"
 )
 
+# --- Data Loading ---
+# Every Streamlit rerun (slider move, tab click) re-executes this script, so Yahoo data is
+# cached across reruns instead of being re-fetched over HTTP each time.
+
+# Seconds a loaded Yahoo response stays cached
+CACHE_TTL = 3600
+
+class NoDataError(Exception):
+    """
+    Raised by a loader when Yahoo returns nothing. st.cache_data never caches exceptions, so a
+    failed fetch is retried on the next rerun instead of being served to every session for an hour.
+    """
+
+@st.cache_resource
+def get_ticker(symbol):
+    """Shared yf.Ticker per symbol."""
+    return yf.Ticker(symbol)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_info(symbol):
+    info = get_ticker(symbol).info
+    if not info:
+        raise NoDataError(f"No data found for '{symbol}'.")
+    return info
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_history(symbol, period):
+    """Price history, also kept on disk so a server restart doesn't re-download it."""
+    hist = file_cache.get_or_fetch_frame(symbol, 'history', lambda: get_ticker(symbol).history(period=period),
+                                         params=period)
+    if hist is None or hist.empty:
+        raise NoDataError(f"No price history found for '{symbol}'.")
+    return hist
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_financials(symbol, kind):
+    """Loads a financial statement; kind is 'financials', 'balance_sheet' or 'cashflow'."""
+    df = getattr(get_ticker(symbol), kind)
+    if df is None or df.empty:
+        raise NoDataError(f"No {kind} data found for '{symbol}'.")
+    return df
+
+# Empty dividends and news are normal answers (non-payers, quiet tickers), so those are cached
+# as they are; raising would re-fetch them on every rerun for those tickers.
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_dividends(symbol):
+    return get_ticker(symbol).dividends
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_news(symbol):
+    return get_ticker(symbol).news
+
 # --- Helper Functions ---
 
 def format_large_number(num):
@@ -27,45 +81,71 @@ def format_large_number(num):
     else:
         return f"{num:,.2f}"
 
-def get_free_cash_flow(stock):
-    """Fetches historical Free Cash Flow (FCF) from Yahoo Finance's financial statements."""
+LARGE_NUMBER_UNITS = (1e12, 1e9, 1e6)
+LARGE_NUMBER_SUFFIXES = ('T', 'B', 'M')
+
+def format_large_numbers(df):
+    """
+    Formats every cell of a numeric DataFrame as a $ string with an M, B, or T suffix.
+    The magnitude bins are picked for the whole frame in one NumPy pass; missing values
+    become empty strings.
+    """
+    values = df.to_numpy(dtype=float)
+    magnitude = np.abs(values)
+    conditions = [magnitude >= unit for unit in LARGE_NUMBER_UNITS]
+    scaled = values / np.select(conditions, LARGE_NUMBER_UNITS, default=1.0)
+    suffixes = np.select(conditions, LARGE_NUMBER_SUFFIXES, default='')
+    
+    labels = [f"${v:,.2f}{suffix}" if v == v else "" for v, suffix in zip(scaled.ravel(), suffixes.ravel())]
+    return pd.DataFrame(np.array(labels, dtype=object).reshape(values.shape), index=df.index, columns=df.columns)
+
+def get_free_cash_flow(symbol):
+    """
+    Extracts the latest Free Cash Flow (FCF) from the cached Yahoo Finance cash flow statement.
+    Not cached itself: the lookup is cheap, and caching the None from a failed fetch would
+    disable DCF for that ticker until the entry expired.
+    """
     try:
-        cash_flow = stock.cashflow
+        cash_flow = load_financials(symbol, 'cashflow')
         if cash_flow.empty:
             return None
-            
-        if 'Free Cash Flow' in cash_flow.index:
-            return cash_flow.loc['Free Cash Flow'].iloc[0]
-        elif 'Total Cash From Operating Activities' in cash_flow.index and 'Capital Expenditures' in cash_flow.index:
-            operating_cf = cash_flow.loc['Total Cash From Operating Activities'].iloc[0]
-            capex = cash_flow.loc['Capital Expenditures'].iloc[0]
-            return operating_cf + capex
+        
+        rows = set(cash_flow.index)
+        if 'Free Cash Flow' in rows:
+            return float(cash_flow.loc['Free Cash Flow'].values[0])
+        elif {'Total Cash From Operating Activities', 'Capital Expenditures'} <= rows:
+            operating_cf = cash_flow.loc['Total Cash From Operating Activities'].values[0]
+            capex = cash_flow.loc['Capital Expenditures'].values[0]
+            return float(operating_cf + capex)
         else:
             return None
     except Exception:
         return None
 
-def perform_dcf_analysis(stock, growth_rate, discount_rate, terminal_growth_rate):
+def perform_dcf_analysis(symbol, growth_rate, discount_rate, terminal_growth_rate):
     """Performs a robust 5-year Discounted Cash Flow (DCF) analysis."""
     if discount_rate <= terminal_growth_rate:
         st.error("Error: Discount Rate must be greater than the Terminal Growth Rate.")
         return None, None, None
 
     try:
-        free_cash_flow = get_free_cash_flow(stock)
+        free_cash_flow = get_free_cash_flow(symbol)
         if free_cash_flow is None:
             st.warning("Could not calculate Free Cash Flow. DCF analysis cannot be performed.")
             return None, None, None
 
-        future_fcf = [free_cash_flow * (1 + growth_rate) ** i for i in range(1, 6)]
+        years = np.arange(1, 6)
+        future_fcf = free_cash_flow * (1 + growth_rate) ** years
+        discount_factors = (1 + discount_rate) ** years
         terminal_value = (future_fcf[-1] * (1 + terminal_growth_rate)) / (discount_rate - terminal_growth_rate)
-        discounted_fcf = [fcf / (1 + discount_rate) ** (i + 1) for i, fcf in enumerate(future_fcf)]
-        discounted_terminal_value = terminal_value / (1 + discount_rate) ** 5
-        enterprise_value = sum(discounted_fcf) + discounted_terminal_value
+        discounted_fcf = future_fcf / discount_factors
+        discounted_terminal_value = terminal_value / discount_factors[-1]
+        enterprise_value = discounted_fcf.sum() + discounted_terminal_value
 
-        total_debt = stock.info.get('totalDebt', 0)
-        cash_and_equivalents = stock.info.get('totalCash', 0)
-        shares_outstanding = stock.info.get('sharesOutstanding', 1)
+        info = load_info(symbol)
+        total_debt = info.get('totalDebt', 0)
+        cash_and_equivalents = info.get('totalCash', 0)
+        shares_outstanding = info.get('sharesOutstanding', 1)
         
         if shares_outstanding == 0:
             st.error("Shares Outstanding is zero.")
@@ -79,14 +159,14 @@ def perform_dcf_analysis(stock, growth_rate, discount_rate, terminal_growth_rate
         st.error(f"DCF Error: {e}")
         return None, None, None
 
-def calculate_ddm_value(stock, growth_rate, required_return):
+def calculate_ddm_value(symbol, growth_rate, required_return):
     """Calculates intrinsic value using Dividend Discount Model (DDM)."""
     try:
-        dividends = stock.dividends
+        dividends = load_dividends(symbol)
         if dividends.empty:
             return None
         
-        latest_dividend = dividends.iloc[-1]
+        latest_dividend = dividends.iat[-1]
         
         if required_return <= growth_rate:
             st.error("Error: Required Return must be greater than Growth Rate for DDM.")
@@ -98,40 +178,123 @@ def calculate_ddm_value(stock, growth_rate, required_return):
         return None
 
 def calculate_rsi(data, window=14):
-    """Calculates Relative Strength Index (RSI)."""
+    """Calculates Relative Strength Index (RSI) with Wilder's smoothing."""
     delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    
+    # Wilder's recursive average: avg = avg * (window - 1) / window + x / window
+    avg_gain = gain.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    avg_loss = loss.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
     
-    rs = gain / loss
+    rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     return rsi
 
+FIB_RATIOS = np.array([0.0, 0.236, 0.382, 0.5, 0.618, 1.0])
+FIB_LABELS = ('0% (High)', '23.6%', '38.2%', '50%', '61.8%', '100% (Low)')
+
 def calculate_fibonacci_levels(data):
-    """Calculates Fibonacci Retracement Levels based on 1-year High/Low."""
+    """
+    Calculates Fibonacci Retracement Levels based on 1-year High/Low.
+    Returns (labels, prices), with prices as an array aligned to FIB_LABELS.
+    """
     max_price = data['High'].max()
     min_price = data['Low'].min()
-    diff = max_price - min_price
-    
-    levels = {
-        '0% (High)': max_price,
-        '23.6%': max_price - 0.236 * diff,
-        '38.2%': max_price - 0.382 * diff,
-        '50%': max_price - 0.5 * diff,
-        '61.8%': max_price - 0.618 * diff,
-        '100% (Low)': min_price
-    }
-    return levels
-
-def analyze_sentiment(news_items):
-    """Analyzes sentiment of news headlines using TextBlob."""
-    if not news_items:
-        return 0, "Neutral"
+    prices = max_price - FIB_RATIOS * (max_price - min_price)
+    return FIB_LABELS, prices
+
+def calculate_indicators(hist, sma_windows=(50, 200)):
+    """
+    Computes the SMA and RSI columns for a price history in one place. Every moving average
+    comes from a single shared cumulative sum of the closes; RSI is a separate Wilder
+    smoothing pass via calculate_rsi.
+    """
+    close = hist['Close'].to_numpy(dtype=np.float64)
+    csum = np.concatenate(([0.0], np.cumsum(close)))
     
-    polarity_sum = 0
-    count = 0
+    indicators = {}
+    for window in sma_windows:
+        sma = np.full(len(close), np.nan)
+        sma[window - 1:] = (csum[window:] - csum[:-window]) / window
+        indicators[f'SMA_{window}'] = sma
+    indicators['RSI'] = calculate_rsi(hist).to_numpy()
+    return indicators
+
+def load_history_with_indicators(symbol, period):
+    """Cached price history with the SMA and RSI columns attached."""
+    hist = load_history(symbol, period)
+    return hist.assign(**calculate_indicators(hist))
+
+CHART_COLUMNS = ['Open', 'High', 'Low', 'Close', 'SMA_50', 'SMA_200']
+
+def chart_window(hist, bars=252):
+    """
+    Last `bars` rows (one trading year by default) of the charted columns, rounded to cents.
+    Plotly serializes every point as JSON text, and full-precision adjusted prices roughly
+    double the payload for no visible difference.
+    """
+    return hist[CHART_COLUMNS].iloc[-bars:].round(2)
+
+# --- Charts ---
+# The charts depend only on the ticker, not on the valuation sliders, so they are built once
+# per (ticker, period) instead of on every rerun. cache_resource hands back the same Figure
+# rather than a pickled copy, which would re-run Plotly's validation on every load; callers
+# must treat the returned figures as read-only. Plotly itself is imported inside price_figure,
+# so it is only loaded once a chart is actually drawn.
+
+def price_figure(chart, height, shapes=(), annotations=()):
+    """
+    Candlestick with SMA 50/200 overlays for a chart_window frame, shared by both charts.
+    Traces and layout go into a single go.Figure call, so Plotly validates the figure once
+    instead of again on every add_trace/add_hline/update_layout.
+    """
+    import plotly.graph_objects as go
+    return go.Figure(
+        data=[
+            go.Candlestick(x=chart.index, open=chart['Open'], high=chart['High'], low=chart['Low'], close=chart['Close'], name='Price'),
+            go.Scatter(x=chart.index, y=chart['SMA_50'], line=dict(color='orange', width=1), name='SMA 50'),
+            go.Scatter(x=chart.index, y=chart['SMA_200'], line=dict(color='blue', width=1), name='SMA 200'),
+        ],
+        layout=dict(xaxis=dict(rangeslider=dict(visible=False)), height=height,
+                    shapes=list(shapes), annotations=list(annotations)),
+    )
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def build_overview_fig(symbol, period="2y"):
+    return price_figure(chart_window(load_history_with_indicators(symbol, period)), height=500)
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def build_technicals_fig(symbol, period="2y"):
+    hist = load_history_with_indicators(symbol, period)
+    fib_labels, fib_prices = calculate_fibonacci_levels(hist.iloc[-252:])
     
-    for item in news_items:
+    # Fib Lines: full-width dotted lines labelled at the top right, as add_hline would draw them
+    shapes = [
+        dict(type='line', xref='x domain', x0=0, x1=1, yref='y', y0=price, y1=price, line=dict(dash='dot'))
+        for price in fib_prices
+    ]
+    annotations = [
+        dict(text=level, xref='x domain', x=1, yref='y', y=price, xanchor='right', yanchor='bottom', showarrow=False)
+        for level, price in zip(fib_labels, fib_prices)
+    ]
+    return price_figure(chart_window(hist), height=600, shapes=shapes, annotations=annotations)
+
+@st.cache_resource(show_spinner=False)
+def get_sentiment_analyzer():
+    """
+    TextBlob's default sentiment analyzer, called directly so each headline skips TextBlob
+    construction. Its lexicon is only loaded on first use, so one throwaway phrase is scored here.
+    """
+    from textblob.sentiments import PatternAnalyzer
+    analyzer = PatternAnalyzer()
+    analyzer.analyze("warm up")
+    return analyzer
+
+def headline_titles(news_items):
+    """Non-empty headline titles from a yfinance news list."""
+    titles = []
+    for item in news_items or []:
         # Handle nested structure if present
         if 'content' in item:
             title = item['content'].get('title', '')
@@ -139,14 +302,21 @@ def analyze_sentiment(news_items):
             title = item.get('title', '')
             
         if title:
-            blob = TextBlob(title)
-            polarity_sum += blob.sentiment.polarity
-            count += 1
-            
-    if count == 0:
+            titles.append(title)
+    return titles
+
+def analyze_sentiment(titles, sentiment_analyzer):
+    """
+    Analyzes sentiment of news headlines using TextBlob's pattern lexicon. Makes no Streamlit
+    calls, so it can run on a worker thread.
+    """
+    if not titles:
         return 0, "Neutral"
-        
-    avg_polarity = polarity_sum / count
+    
+    # All headlines are scored as one text, so the analyzer tokenizes once instead of once per
+    # title; the result is the average over every sentiment-bearing word rather than an average
+    # of per-title scores.
+    avg_polarity = sentiment_analyzer.analyze(". ".join(titles)).polarity
     
     if avg_polarity > 0.1:
         sentiment = "Positive"
@@ -177,8 +347,31 @@ if not ticker_symbol:
     st.warning("Enter a ticker symbol.")
 else:
     try:
-        stock = yf.Ticker(ticker_symbol)
-        info = stock.info
+        # The Yahoo requests below are independent, so warm all their caches concurrently and
+        # pay the slowest round-trip instead of the sum. Fetch errors are left to surface where
+        # each piece of data is used, as before. Only done when the ticker changes or the loader
+        # caches have expired; other slider and tab reruns would just find them already warm.
+        last_prefetch = st.session_state.get('prefetch')
+        if (last_prefetch is None or last_prefetch[0] != ticker_symbol
+                or time.time() - last_prefetch[1] >= CACHE_TTL):
+            prefetch = [
+                (load_info, ticker_symbol),
+                (load_history, ticker_symbol, "2y"),
+                (load_financials, ticker_symbol, 'financials'),
+                (load_financials, ticker_symbol, 'balance_sheet'),
+                (load_financials, ticker_symbol, 'cashflow'),
+                (load_dividends, ticker_symbol),
+                (load_news, ticker_symbol),
+            ]
+            with ThreadPoolExecutor(max_workers=len(prefetch)) as executor:
+                for loader, *args in prefetch:
+                    executor.submit(loader, *args)
+            st.session_state['prefetch'] = (ticker_symbol, time.time())
+        
+        try:
+            info = load_info(ticker_symbol)
+        except NoDataError:
+            info = {}
         
         if 'regularMarketPrice' not in info:
              st.error(f"No data found for '{ticker_symbol}'.")
@@ -194,6 +387,14 @@ else:
             
             current_price = info.get('regularMarketPrice')
             
+            # One 2-year fetch serves both the 1-year Overview chart and the Technicals tab,
+            # with Moving Averages and RSI computed once on the full series. Without price bars
+            # only the charts and signals are skipped; the other tabs still render.
+            try:
+                hist_2y = load_history_with_indicators(ticker_symbol, "2y")
+            except NoDataError:
+                hist_2y = pd.DataFrame()
+            
             # --- Tabs ---
             tab_overview, tab_financials, tab_valuation, tab_technicals, tab_news = st.tabs(["Overview", "Financials", "Valuation", "Technicals", "News & Social"])
             
@@ -207,18 +408,10 @@ else:
                 m4.metric("Beta", f"{info.get('beta', 'N/A')}")
                 
                 st.subheader("Price History")
-                hist = stock.history(period="1y")
-                
-                # Moving Averages
-                hist['SMA_50'] = hist['Close'].rolling(window=50).mean()
-                hist['SMA_200'] = hist['Close'].rolling(window=200).mean()
-                
-                fig = go.Figure()
-                fig.add_trace(go.Candlestick(x=hist.index, open=hist['Open'], high=hist['High'], low=hist['Low'], close=hist['Close'], name='Price'))
-                fig.add_trace(go.Scatter(x=hist.index, y=hist['SMA_50'], line=dict(color='orange', width=1), name='SMA 50'))
-                fig.add_trace(go.Scatter(x=hist.index, y=hist['SMA_200'], line=dict(color='blue', width=1), name='SMA 200'))
-                fig.update_layout(xaxis_rangeslider_visible=False, height=500)
-                st.plotly_chart(fig, use_container_width=True)
+                if hist_2y.empty:
+                    st.info("No price history available.")
+                else:
+                    st.plotly_chart(build_overview_fig(ticker_symbol, "2y"), use_container_width=True)
                 
                 st.write(info.get('longBusinessSummary', ''))
 
@@ -227,17 +420,21 @@ else:
                 st.subheader("Financial Statements")
                 stmt_type = st.selectbox("Select Statement", ["Income Statement", "Balance Sheet", "Cash Flow"])
                 
-                if stmt_type == "Income Statement":
-                    df = stock.financials
-                elif stmt_type == "Balance Sheet":
-                    df = stock.balance_sheet
-                else:
-                    df = stock.cashflow
+                try:
+                    if stmt_type == "Income Statement":
+                        df = load_financials(ticker_symbol, 'financials')
+                    elif stmt_type == "Balance Sheet":
+                        df = load_financials(ticker_symbol, 'balance_sheet')
+                    else:
+                        df = load_financials(ticker_symbol, 'cashflow')
+                except NoDataError:
+                    df = pd.DataFrame()
                 
                 if df.empty:
                     st.info("No data available.")
                 else:
-                    st.dataframe(df.style.format("${:,.0f}"))
+                    # Format to plain strings up front; a Styler would render per-cell HTML/CSS
+                    st.dataframe(format_large_numbers(df))
 
             # --- Valuation Tab ---
             with tab_valuation:
@@ -247,7 +444,7 @@ else:
                 
                 with col_dcf:
                     st.markdown("### DCF Analysis")
-                    dcf_val, future_fcf, term_val = perform_dcf_analysis(stock, dcf_growth, dcf_discount, dcf_terminal)
+                    dcf_val, future_fcf, term_val = perform_dcf_analysis(ticker_symbol, dcf_growth, dcf_discount, dcf_terminal)
                     if dcf_val:
                         st.metric("Intrinsic Value (DCF)", f"${dcf_val:,.2f}", delta=f"{dcf_val-current_price:,.2f}")
                         if dcf_val > current_price:
@@ -259,7 +456,7 @@ else:
 
                 with col_ddm:
                     st.markdown("### DDM Analysis")
-                    ddm_val = calculate_ddm_value(stock, ddm_growth, ddm_return)
+                    ddm_val = calculate_ddm_value(ticker_symbol, ddm_growth, ddm_return)
                     if ddm_val:
                         st.metric("Intrinsic Value (DDM)", f"${ddm_val:,.2f}", delta=f"{ddm_val-current_price:,.2f}")
                         if ddm_val > current_price:
@@ -273,19 +470,17 @@ else:
             with tab_technicals:
                 st.subheader("Technical Analysis Signals")
                 
-                hist = stock.history(period="2y") # Need more data for SMA 200
+                hist = hist_2y # Need more data for SMA 200
                 if len(hist) < 200:
                     st.warning("Not enough historical data for technical analysis.")
                 else:
                     # Calculations
-                    hist['SMA_50'] = hist['Close'].rolling(window=50).mean()
-                    hist['SMA_200'] = hist['Close'].rolling(window=200).mean()
-                    hist['RSI'] = calculate_rsi(hist)
-                    fib_levels = calculate_fibonacci_levels(hist[-252:]) # Last 1 year for Fib
+                    hist_1y = hist.iloc[-252:]
+                    fib_labels, fib_prices = calculate_fibonacci_levels(hist_1y) # Last 1 year for Fib
                     
-                    current_sma_50 = hist['SMA_50'].iloc[-1]
-                    current_sma_200 = hist['SMA_200'].iloc[-1]
-                    current_rsi = hist['RSI'].iloc[-1]
+                    current_sma_50 = hist['SMA_50'].iat[-1]
+                    current_sma_200 = hist['SMA_200'].iat[-1]
+                    current_rsi = hist['RSI'].iat[-1]
                     
                     # Signals
                     col_sig1, col_sig2, col_sig3 = st.columns(3)
@@ -318,7 +513,8 @@ else:
                     # 3. Fibonacci
                     with col_sig3:
                         st.markdown("#### Fibonacci Levels (1Y)")
-                        closest_level = min(fib_levels.items(), key=lambda x: abs(x[1] - current_price))
+                        closest_idx = int(np.abs(fib_prices - current_price).argmin())
+                        closest_level = (fib_labels[closest_idx], fib_prices[closest_idx])
                         st.metric("Nearest Level", f"{closest_level[0]}: ${closest_level[1]:,.2f}")
                         
                         if current_price > closest_level[1]:
@@ -328,17 +524,7 @@ else:
 
                     # Chart with Indicators
                     st.subheader("Technical Chart")
-                    fig_tech = go.Figure()
-                    fig_tech.add_trace(go.Candlestick(x=hist.index[-252:], open=hist['Open'][-252:], high=hist['High'][-252:], low=hist['Low'][-252:], close=hist['Close'][-252:], name='Price'))
-                    fig_tech.add_trace(go.Scatter(x=hist.index[-252:], y=hist['SMA_50'][-252:], line=dict(color='orange', width=1), name='SMA 50'))
-                    fig_tech.add_trace(go.Scatter(x=hist.index[-252:], y=hist['SMA_200'][-252:], line=dict(color='blue', width=1), name='SMA 200'))
-                    
-                    # Add Fib Lines
-                    for level, price in fib_levels.items():
-                        fig_tech.add_hline(y=price, line_dash="dot", annotation_text=level, annotation_position="top right")
-
-                    fig_tech.update_layout(xaxis_rangeslider_visible=False, height=600)
-                    st.plotly_chart(fig_tech, use_container_width=True)
+                    st.plotly_chart(build_technicals_fig(ticker_symbol, "2y"), use_container_width=True)
 
             # --- News & Social Tab ---
             with tab_news:
@@ -348,29 +534,44 @@ else:
                 
                 with col_news:
                     st.markdown("### News Sentiment")
-                    news = stock.news
-                    avg_polarity, sentiment_label = analyze_sentiment(news)
+                    news = load_news(ticker_symbol)
+                    titles = headline_titles(news)
                     
-                    st.metric("Average Sentiment Polarity", f"{avg_polarity:.2f}")
-                    if sentiment_label == "Positive":
-                        st.success(f"Overall Sentiment: **{sentiment_label}**")
-                    elif sentiment_label == "Negative":
-                        st.error(f"Overall Sentiment: **{sentiment_label}**")
-                    else:
-                        st.info(f"Overall Sentiment: **{sentiment_label}**")
+                    # TextBlob is only imported and loaded once there is something to score. The
+                    # cached analyzer is fetched here on the script thread, where Streamlit's
+                    # cache has its run context, and handed to the worker.
+                    sentiment_analyzer = get_sentiment_analyzer() if titles else None
+                    
+                    # Score sentiment on a worker thread while the headlines render; the
+                    # placeholder keeps the result above the list once it is ready
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        sentiment_future = executor.submit(analyze_sentiment, titles, sentiment_analyzer)
+                        sentiment_placeholder = st.empty()
+                        sentiment_placeholder.caption("Analyzing sentiment...")
+                        
+                        st.markdown("#### Recent Headlines")
+                        for item in news[:5]: # Show top 5
+                            # Handle nested structure
+                            if 'content' in item:
+                                title = item['content'].get('title', 'No Title')
+                                link_obj = item['content'].get('clickThroughUrl')
+                                link = link_obj.get('url') if link_obj else '#'
+                            else:
+                                title = item.get('title', 'No Title')
+                                link = item.get('link', '#')
+                                
+                            st.write(f"- [{title}]({link})")
                         
-                    st.markdown("#### Recent Headlines")
-                    for item in news[:5]: # Show top 5
-                        # Handle nested structure
-                        if 'content' in item:
-                            title = item['content'].get('title', 'No Title')
-                            link_obj = item['content'].get('clickThroughUrl')
-                            link = link_obj.get('url') if link_obj else '#'
+                        avg_polarity, sentiment_label = sentiment_future.result()
+                    
+                    with sentiment_placeholder.container():
+                        st.metric("Average Sentiment Polarity", f"{avg_polarity:.2f}")
+                        if sentiment_label == "Positive":
+                            st.success(f"Overall Sentiment: **{sentiment_label}**")
+                        elif sentiment_label == "Negative":
+                            st.error(f"Overall Sentiment: **{sentiment_label}**")
                         else:
-                            title = item.get('title', 'No Title')
-                            link = item.get('link', '#')
-                            
-                        st.write(f"- [{title}]({link})")
+                            st.info(f"Overall Sentiment: **{sentiment_label}**")
 
                 with col_analyst:
                     st.markdown("### Analyst Consensus")
@@ -383,28 +584,37 @@ else:
                     
                     if target_mean:
                         st.metric("Mean Target Price", f"${target_mean:,.2f}", delta=f"{target_mean-current_price:,.2f}")
-                        st.write(f"**High Target:** ${target_high:,.2f}")
-                        st.write(f"**Low Target:** ${target_low:,.2f}")
                         
-                        # Gauge Chart for Target Price
-                        fig_gauge = go.Figure(go.Indicator(
-                            mode = "gauge+number+delta",
-                            value = current_price,
-                            domain = {'x': [0, 1], 'y': [0, 1]},
-                            title = {'text': "Current Price vs Target Range"},
-                            delta = {'reference': target_mean},
-                            gauge = {
-                                'axis': {'range': [target_low * 0.9, target_high * 1.1]},
-                                'bar': {'color': "black"},
-                                'steps': [
-                                    {'range': [target_low * 0.9, target_low], 'color': "red"},
-                                    {'range': [target_low, target_high], 'color': "lightgreen"},
-                                    {'range': [target_high, target_high * 1.1], 'color': "green"}],
-                                'threshold': {
-                                    'line': {'color': "blue", 'width': 4},
-                                    'thickness': 0.75,
-                                    'value': target_mean}}))
-                        st.plotly_chart(fig_gauge, use_container_width=True)
+                        if target_low and target_high and target_high > target_low:
+                            st.write(f"**High Target:** ${target_high:,.2f}")
+                            st.write(f"**Low Target:** ${target_low:,.2f}")
+                            
+                            # Where the current price sits within the analyst range; a plain bar
+                            # instead of a Plotly figure for the common case
+                            position = (current_price - target_low) / (target_high - target_low)
+                            st.progress(min(max(position, 0.0), 1.0), text="Current price within Low-High target range")
+                            
+                            # The gauge is only built (and serialized) when asked for
+                            if st.checkbox("Show detailed gauge", key="show_target_gauge"):
+                                import plotly.graph_objects as go
+                                fig_gauge = go.Figure(go.Indicator(
+                                    mode = "gauge+number+delta",
+                                    value = current_price,
+                                    domain = {'x': [0, 1], 'y': [0, 1]},
+                                    title = {'text': "Current Price vs Target Range"},
+                                    delta = {'reference': target_mean},
+                                    gauge = {
+                                        'axis': {'range': [target_low * 0.9, target_high * 1.1]},
+                                        'bar': {'color': "black"},
+                                        'steps': [
+                                            {'range': [target_low * 0.9, target_low], 'color': "red"},
+                                            {'range': [target_low, target_high], 'color': "lightgreen"},
+                                            {'range': [target_high, target_high * 1.1], 'color': "green"}],
+                                        'threshold': {
+                                            'line': {'color': "blue", 'width': 4},
+                                            'thickness': 0.75,
+                                            'value': target_mean}}))
+                                st.plotly_chart(fig_gauge, use_container_width=True)
                     else:
                         st.info("No analyst target price data available.")
 